@@ -1,149 +1,386 @@
 #!/usr/bin/env python3
 import argparse
 import datetime as dt
+import functools
+import hashlib
 import html
-import re
-from typing import Iterable
-
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence, TextIO
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
 
 from imdb_utils import (
-    add_filter_args,
-    add_imdb_paths_args,
-    add_last_n_years_arg,
-    add_runtime_args,
-    add_sort_format_args,
-    add_title_type_arg,
-    add_year_range_args,
+    BASICS_DTYPES,
+    GENRE_BITS,
+    RATINGS_DTYPES,
+    USECOLS_BASICS,
+    USECOLS_RATINGS,
+    add_arg_groups,
+    apply_dtypes,
+    build_arrow_filters,
+    build_filter_expr,
+    decode_tid,
+    parse_genre_args,
+    parse_genre_names,
+    read_and_filter_tsv,
+    read_ratings,
     read_tsv_auto,
+    scan_tsv,
+    write_parquet_atomic,
 )
 
-def load_data(basics_path: str, ratings_path: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+_worker_groups: dict[int, pd.DataFrame] = {}
+_worker_empty = None
+
+# Each pool worker re-imports pandas and pyarrow before it does any work
+# (a couple of seconds), while a year's cards render at roughly 5 us per
+# row, so only selections this large are worth spreading across processes.
+PARALLEL_RENDER_MIN_ROWS = 500_000
+
+OUTPUT_COLUMNS = [
+    "tconst",
+    "primaryTitle",
+    "startYear",
+    "averageRating",
+    "numVotes",
+    "genres",
+    "runtimeMinutes",
+    "titleType",
+]
+TITLE_COLUMNS = OUTPUT_COLUMNS + ["genre_mask"]
+
+
+def load_data(
+    basics_path: str,
+    ratings_path: str,
+    engine: str = "pyarrow",
+    cache: bool = False,
+    row_filters: tuple[pc.Expression, pc.Expression] | None = None,
+) -> tuple[pd.DataFrame, dict[str, np.ndarray]]:
     print("Loading data...")
-    basics = read_tsv_auto(basics_path)
-    ratings = read_tsv_auto(ratings_path)
-    return basics, ratings
+    basics, ratings = read_basics_and_ratings(
+        basics_path,
+        ratings_path,
+        engine=engine,
+        cache=cache,
+        row_filters=row_filters,
+    )
+    return normalize_basics(basics), ratings
+
+
+def read_basics_and_ratings(
+    basics_path: str,
+    ratings_path: str,
+    engine: str = "pyarrow",
+    cache: bool = False,
+    row_filters: tuple[pc.Expression, pc.Expression] | None = None,
+) -> tuple[pd.DataFrame, dict[str, np.ndarray]]:
+    # The parsers release the GIL, so the two files load side by side; Arrow
+    # readers share one CPU-sized pool, which keeps the total thread count capped.
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        if row_filters is not None:
+            basics_filter, ratings_filter = row_filters
+            basics = ex.submit(
+                read_and_filter_tsv,
+                basics_path,
+                basics_filter,
+                usecols=USECOLS_BASICS,
+                dtypes=BASICS_DTYPES,
+            )
+            ratings = ex.submit(read_ratings, ratings_path, filter_expr=ratings_filter)
+        else:
+            basics = ex.submit(
+                read_tsv_auto,
+                basics_path,
+                usecols=USECOLS_BASICS,
+                engine=engine,
+                dtypes=BASICS_DTYPES,
+                cache=cache,
+            )
+            ratings = ex.submit(read_ratings, ratings_path, engine=engine, cache=cache)
+        return basics.result(), ratings.result()
+
+
+def normalize_basics(basics: pd.DataFrame) -> pd.DataFrame:
+    # tconst order is the tie-break for the stable per-year sort, whatever
+    # order the reader or join produced the rows in.
+    basics = basics.sort_values("tconst", ignore_index=True)
+    basics["genres"] = basics["genres"].fillna("")
+    basics["genre_mask"] = genre_bitmasks(basics["genres"])
+    return basics
+
+
+def genre_bitmasks(genres: pd.Series) -> np.ndarray:
+    lists = pc.split_pattern(pc.utf8_lower(pa.array(genres, type=pa.string())), ",")
+    # Unknown genre names map to the trailing zero bit.
+    codes = pc.index_in(pc.list_flatten(lists), value_set=pa.array(list(GENRE_BITS)))
+    bits = np.array([*GENRE_BITS.values(), 0], dtype=np.uint32)
+    masks = np.zeros(len(genres), dtype=np.uint32)
+    np.bitwise_or.at(
+        masks,
+        pc.list_parent_indices(lists).to_numpy(),
+        bits[codes.fill_null(len(GENRE_BITS)).to_numpy()],
+    )
+    return masks
 
 
-def parse_genre_list(value: str | None) -> list[str]:
-    if not value:
-        return []
-    return [item.strip() for item in value.split(",") if item.strip()]
+def scan_titles(basics_path: str, ratings_path: str, predicate: "pl.Expr") -> pd.DataFrame:
+    print("Loading data...")
+    basics = scan_tsv(basics_path, usecols=USECOLS_BASICS)
+    ratings = scan_tsv(ratings_path, usecols=USECOLS_RATINGS)
+    titles = (
+        basics.join(ratings, on="tconst", how="inner")
+        .filter(predicate)
+        .collect(engine="streaming")
+        .to_pandas(use_pyarrow_extension_array=True)
+    )
+    titles = normalize_basics(apply_dtypes(titles, {**BASICS_DTYPES, **RATINGS_DTYPES}))
+    titles["numVotes"] = titles["numVotes"].astype("int32")
+    return titles[TITLE_COLUMNS].reset_index(drop=True)
+
+
+def merge_titles(basics: pd.DataFrame, ratings: dict[str, np.ndarray]) -> pd.DataFrame:
+    positions = pd.Index(ratings["tconst"]).get_indexer(basics["tconst"])
+    rated = positions >= 0
+    positions = positions[rated]
+    df = basics[rated].assign(
+        averageRating=ratings["averageRating"][positions],
+        numVotes=ratings["numVotes"][positions],
+    )
+    return df[TITLE_COLUMNS].reset_index(drop=True)
 
 
-def build_genre_pattern(genres: list[str]) -> str:
-    escaped = [re.escape(g) for g in genres]
-    return "|".join(escaped)
+def titles_cache_path(basics_path: str, ratings_path: str) -> Path:
+    stamps = [",".join(TITLE_COLUMNS)]
+    for path in (basics_path, ratings_path):
+        stat = os.stat(path)
+        stamps.append(f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}")
+    key = hashlib.sha1("|".join(stamps).encode()).hexdigest()[:16]
+    return Path.home() / ".cache" / "imdb_toolkit" / f"{key}.parquet"
 
 
-def apply_genre_filters(
-    df: pd.DataFrame,
-    include_genres: list[str],
-    exclude_genres: list[str],
+def load_titles(
+    basics_path: str,
+    ratings_path: str,
+    use_cache: bool,
+    engine: str = "pyarrow",
+    predicate: "pl.Expr | None" = None,
+    row_filters: tuple[pc.Expression, pc.Expression] | None = None,
 ) -> pd.DataFrame:
-    df["genres"] = df["genres"].fillna("")
-    if include_genres:
-        pattern = build_genre_pattern(include_genres)
-        df = df[df["genres"].str.contains(pattern, case=False, na=False)]
-    if exclude_genres:
-        pattern = build_genre_pattern(exclude_genres)
-        df = df[~df["genres"].str.contains(pattern, case=False, na=False)]
-    return df
-
-
-def apply_runtime_filters(
+    # Without a cache to fill, only the rows that can reach the output have
+    # to be materialised.
+    if engine == "polars" and predicate is not None and not use_cache:
+        return scan_titles(basics_path, ratings_path, predicate)
+    if engine == "pyarrow" and row_filters is not None and not use_cache:
+        basics, ratings = load_data(basics_path, ratings_path, row_filters=row_filters)
+        return merge_titles(basics, ratings)
+    cache_path = titles_cache_path(basics_path, ratings_path) if use_cache else None
+    if cache_path is not None and cache_path.exists():
+        print(f"Loading cached data from {cache_path}...")
+        try:
+            return pd.read_parquet(cache_path)
+        except (OSError, pa.ArrowInvalid) as exc:
+            print(f"Could not read cache {cache_path}, rebuilding: {exc}")
+    basics, ratings = load_data(basics_path, ratings_path, engine=engine, cache=use_cache)
+    titles = merge_titles(basics, ratings)
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_parquet_atomic(titles, cache_path)
+        except OSError as exc:
+            print(f"Could not write cache {cache_path}: {exc}")
+    return titles
+
+
+def format_tconst(ids: pd.Series) -> pd.Series:
+    return "tt" + ids.astype(str).str.zfill(7)
+
+
+def select_rows(
     df: pd.DataFrame,
+    title_type: str,
+    years: Sequence[int],
+    min_votes: int,
+    min_rating: float,
     min_runtime: int | None,
     max_runtime: int | None,
+    include_mask: int | None,
+    exclude_mask: int,
 ) -> pd.DataFrame:
-    if min_runtime is None and max_runtime is None:
-        return df
-    df["runtimeMinutes"] = pd.to_numeric(df["runtimeMinutes"], errors="coerce")
-    if min_runtime is not None:
-        df = df[df["runtimeMinutes"] >= min_runtime]
-    if max_runtime is not None:
-        df = df[df["runtimeMinutes"] <= max_runtime]
-    return df
+    title_types = df["titleType"].cat
+    if title_type not in title_types.categories:
+        return df.iloc[0:0]
+    start_years = df["startYear"]
+    years_arr = start_years.to_numpy(dtype=np.int16, na_value=0)
+    genres = df["genre_mask"].to_numpy(dtype=np.uint32)
+    mask = title_types.codes.to_numpy() == title_types.categories.get_loc(title_type)
+    # Titles without a year or runtime never pass a bound on it.
+    mask &= start_years.notna().to_numpy(dtype=bool)
+    mask &= (years_arr >= years[0]) & (years_arr <= years[-1])
+    mask &= df["numVotes"].to_numpy(dtype=np.int32) >= min_votes
+    mask &= df["averageRating"].to_numpy(dtype=np.float64) >= min_rating
+    mask &= (genres & np.uint32(exclude_mask)) == 0
+    if include_mask is not None:
+        mask &= (genres & np.uint32(include_mask)) != 0
+    if min_runtime is not None or max_runtime is not None:
+        runtime = df["runtimeMinutes"]
+        mask &= runtime.notna().to_numpy(dtype=bool)
+        runtime_arr = runtime.to_numpy(dtype=np.int32, na_value=0)
+        if min_runtime is not None:
+            mask &= runtime_arr >= min_runtime
+        if max_runtime is not None:
+            mask &= runtime_arr <= max_runtime
+    return df[mask]
+
+
+def prepare_corpus(
+    titles: pd.DataFrame,
+    years: Sequence[int],
+    title_type: str,
+    include_mask: int | None,
+    exclude_mask: int,
+    min_votes: int,
+    min_rating: float,
+    min_runtime: int | None,
+    max_runtime: int | None,
+    sort_by: str,
+    limit_per_year: int | None,
+) -> tuple[pd.DataFrame, dict[int, pd.DataFrame]]:
+    df = select_rows(
+        titles,
+        title_type,
+        years,
+        min_votes,
+        min_rating,
+        min_runtime,
+        max_runtime,
+        include_mask,
+        exclude_mask,
+    )
+    # One stable sort of the whole corpus leaves every year's rows in the
+    # same order a per-year sort would.
+    keys, ascending = sort_keys(sort_by)
+    df = df.sort_values(by=keys, ascending=ascending, kind="stable")
+    if limit_per_year:
+        df = df.groupby("startYear", sort=False).head(limit_per_year)
+    groups = dict(list(df.groupby("startYear", sort=False)))
+    return df, groups
 
 
-def sort_titles(df: pd.DataFrame, sort_by: str) -> pd.DataFrame:
+def sort_keys(sort_by: str) -> tuple[list[str], list[bool]]:
     if sort_by == "votes":
-        df.sort_values(
-            by=["numVotes", "averageRating"],
-            ascending=[False, False],
-            inplace=True,
-        )
-        return df
+        return ["numVotes", "averageRating"], [False, False]
     if sort_by == "title":
-        df.sort_values(by=["primaryTitle"], ascending=[True], inplace=True)
-        return df
-    df.sort_values(
-        by=["averageRating", "numVotes"],
-        ascending=[False, False],
-        inplace=True,
-    )
-    return df
-
-
-def filter_one_year(
-    basics: pd.DataFrame,
-    ratings: pd.DataFrame,
-    year: int,
+        return ["primaryTitle"], [True]
+    return ["averageRating", "numVotes"], [False, False]
+
+
+@dataclass
+class Pipeline:
+    corpus: pd.DataFrame
+    groups: dict[int, pd.DataFrame]
+    years: list[int]
+    title_type: str
+    min_votes: int
+    min_rating: float
+    include_genres: list[str]
+    exclude_genres: list[str]
+    min_runtime: int | None
+    max_runtime: int | None
+    sort_by: str
+    limit_per_year: int | None
+
+
+def build_pipeline(
+    titles: pd.DataFrame,
+    years: Iterable[int],
     min_votes: int,
     min_rating: float,
     title_type: str,
     include_genres: list[str],
     exclude_genres: list[str],
+    include_mask: int | None,
+    exclude_mask: int,
     min_runtime: int | None,
     max_runtime: int | None,
     sort_by: str,
     limit_per_year: int | None,
-) -> pd.DataFrame:
-    df = basics.merge(ratings, on="tconst", how="inner")
-
-    df = df[df["titleType"] == title_type].copy()
+) -> Pipeline:
+    years = list(years)
+    corpus, groups = prepare_corpus(
+        titles,
+        years=years,
+        title_type=title_type,
+        include_mask=include_mask,
+        exclude_mask=exclude_mask,
+        min_votes=min_votes,
+        min_rating=min_rating,
+        min_runtime=min_runtime,
+        max_runtime=max_runtime,
+        sort_by=sort_by,
+        limit_per_year=limit_per_year,
+    )
+    return Pipeline(
+        corpus=corpus,
+        groups=groups,
+        years=years,
+        title_type=title_type,
+        min_votes=min_votes,
+        min_rating=min_rating,
+        include_genres=include_genres,
+        exclude_genres=exclude_genres,
+        min_runtime=min_runtime,
+        max_runtime=max_runtime,
+        sort_by=sort_by,
+        limit_per_year=limit_per_year,
+    )
 
-    df["startYear"] = pd.to_numeric(df["startYear"], errors="coerce").astype("Int64")
-    df = df[df["startYear"] == year]
 
-    df = apply_genre_filters(df, include_genres, exclude_genres)
+def year_frame(groups: dict[int, pd.DataFrame], empty: pd.DataFrame, year: int) -> pd.DataFrame:
+    return groups.get(year, empty)
 
-    df = df[
-        (df["numVotes"] >= min_votes) &
-        (df["averageRating"] >= min_rating)
-    ].copy()
 
-    df = apply_runtime_filters(df, min_runtime, max_runtime)
-    df = sort_titles(df, sort_by)
-    if limit_per_year:
-        return df.head(limit_per_year).copy()
-    return df
+def missing_as_nan(values: pd.Series) -> pd.Series:
+    # Nullable columns would render missing values as <NA>; output shows nan.
+    return values.astype(object).where(values.notna(), "nan")
 
 
-def format_movie_line(row: pd.Series) -> str:
-    return (
-        f"  {row['primaryTitle']} "
-        f"(rating={row['averageRating']}, votes={row['numVotes']}, "
-        f"genres={row['genres']}, id={row['tconst']})"
-    )
+def format_movie_lines(df: pd.DataFrame) -> list[str]:
+    return [
+        f"  {title} (rating={rating}, votes={votes}, genres={genres}, id={tconst})"
+        for title, rating, votes, genres, tconst in zip(
+            missing_as_nan(df["primaryTitle"]).to_numpy(),
+            df["averageRating"].to_numpy(),
+            df["numVotes"].to_numpy(),
+            df["genres"].to_numpy(),
+            map(decode_tid, df["tconst"].to_numpy()),
+        )
+    ]
 
 
-def format_runtime(runtime: float | int | None) -> str:
-    if runtime is None or pd.isna(runtime):
-        return "NA"
-    return f"{int(runtime)} min"
+def format_runtime(runtime: pd.Series) -> np.ndarray:
+    minutes = runtime.fillna(0).astype("int64").astype(str) + " min"
+    return np.where(runtime.isna().to_numpy(), "NA", minutes.to_numpy(dtype=object))
 
 
-def format_votes(votes: float | int | None) -> str:
-    if votes is None or pd.isna(votes):
-        return "NA"
-    return f"{int(votes):,}"
+def format_votes(votes: pd.Series) -> np.ndarray:
+    return votes.map("{:,}".format, na_action="ignore").fillna("NA").to_numpy()
 
 
-def format_rating(rating: float | int | None) -> str:
-    if rating is None or pd.isna(rating):
-        return "NA"
-    return f"{float(rating):.1f}"
+def format_rating(rating: pd.Series) -> np.ndarray:
+    return rating.map("{:.1f}".format, na_action="ignore").fillna("NA").to_numpy()
 
 
 def build_html_header(title: str, subtitle: str, nav_html: str) -> str:
@@ -388,138 +625,153 @@ def build_html_footer(generated_at: str) -> str:
 """
 
 
-def build_year_section(year: int, df: pd.DataFrame) -> list[str]:
-    lines = [str(year)]
-    if df.empty:
-        return lines + ["  (no titles)", ""]
-    lines.extend(format_movie_line(row) for _, row in df.iterrows())
-    lines.append("")
-    return lines
+_escape = functools.lru_cache(maxsize=1 << 16)(html.escape)
 
 
-def build_output(
-    basics: pd.DataFrame,
-    ratings: pd.DataFrame,
-    years: Iterable[int],
-    min_votes: int,
-    min_rating: float,
-    title_type: str,
-    include_genres: list[str],
-    exclude_genres: list[str],
-    min_runtime: int | None,
-    max_runtime: int | None,
-    sort_by: str,
-    limit_per_year: int | None,
-) -> list[str]:
-    out_lines: list[str] = []
-    for year in years:
-        print(f"Processing {year}...")
-        df = filter_one_year(
-            basics,
-            ratings,
-            year=year,
-            min_votes=min_votes,
-            min_rating=min_rating,
-            title_type=title_type,
-            include_genres=include_genres,
-            exclude_genres=exclude_genres,
-            min_runtime=min_runtime,
-            max_runtime=max_runtime,
-            sort_by=sort_by,
-            limit_per_year=limit_per_year,
-        )
-        out_lines.extend(build_year_section(year, df))
-    return out_lines
+def escape_column(values: pd.Series) -> np.ndarray:
+    # Missing values render as nan, like the text output.
+    return missing_as_nan(values).map(lambda value: _escape(str(value))).to_numpy()
 
 
-def build_html_page(
-    basics: pd.DataFrame,
-    ratings: pd.DataFrame,
-    years: Iterable[int],
-    min_votes: int,
-    min_rating: float,
-    title_type: str,
-    include_genres: list[str],
-    exclude_genres: list[str],
-    min_runtime: int | None,
-    max_runtime: int | None,
-    sort_by: str,
-    limit_per_year: int | None,
-) -> str:
-    years_list = list(years)
-    title = f"{years_list[0]}-{years_list[-1]} {title_type.title()}s"
-    filters = []
-    filters.append(f"Min votes: {min_votes}")
-    filters.append(f"Min rating: {min_rating}")
-    if include_genres:
-        filters.append(f"Include genres: {', '.join(include_genres)}")
-    if exclude_genres:
-        filters.append(f"Exclude genres: {', '.join(exclude_genres)}")
-    if min_runtime is not None or max_runtime is not None:
-        min_r = min_runtime if min_runtime is not None else 0
-        max_r = max_runtime if max_runtime is not None else "any"
-        filters.append(f"Runtime: {min_r}-{max_r} min")
-    filters.append(f"Sort by: {sort_by}")
-    if limit_per_year:
-        filters.append(f"Limit per year: {limit_per_year}")
-
-    total_titles = 0
-    sections = []
-    years_with_titles: list[int] = []
-    for year in years_list:
-        df = filter_one_year(
-            basics,
-            ratings,
-            year=year,
-            min_votes=min_votes,
-            min_rating=min_rating,
-            title_type=title_type,
-            include_genres=include_genres,
-            exclude_genres=exclude_genres,
-            min_runtime=min_runtime,
-            max_runtime=max_runtime,
-            sort_by=sort_by,
-            limit_per_year=limit_per_year,
-        )
-        total_titles += len(df)
-        if df.empty:
-            continue
-        years_with_titles.append(year)
-        cards = []
-        for idx, (_, row) in enumerate(df.iterrows(), start=1):
-            cards.append(
-                f"""
+def build_movie_cards(df: pd.DataFrame) -> list[str]:
+    cards = []
+    rows = zip(
+        escape_column(df["primaryTitle"]),
+        format_rating(df["averageRating"]),
+        format_votes(df["numVotes"]),
+        format_runtime(df["runtimeMinutes"]),
+        escape_column(df["genres"]),
+        escape_column(df["startYear"]),
+        escape_column(df["titleType"]),
+        map(decode_tid, df["tconst"].to_numpy()),
+    )
+    for idx, (name, rating, votes, runtime, genres, start_year, ttype, tconst) in enumerate(
+        rows, start=1
+    ):
+        cards.append(
+            f"""
         <article class="movie-card" style="--i: {idx}">
-          <h3>{html.escape(str(row.get('primaryTitle', 'Untitled')))}</h3>
+          <h3>{name}</h3>
           <div class="movie-meta">
-            <div class="pill">Rating {format_rating(row.get('averageRating'))}</div>
-            <div>Votes: {format_votes(row.get('numVotes'))}</div>
-            <div>Runtime: {format_runtime(row.get('runtimeMinutes'))}</div>
+            <div class="pill">Rating {rating}</div>
+            <div>Votes: {votes}</div>
+            <div>Runtime: {runtime}</div>
           </div>
           <details class="movie-details">
             <summary>More details</summary>
             <div class="details-content">
-              <div>Genres: {html.escape(str(row.get('genres', '') or ''))}</div>
-              <div>Year: {html.escape(str(row.get('startYear', '')))}</div>
-              <div>Type: {html.escape(str(row.get('titleType', '')))}</div>
-              <div>IMDb ID: {html.escape(str(row.get('tconst', '')))}</div>
+              <div>Genres: {genres}</div>
+              <div>Year: {start_year}</div>
+              <div>Type: {ttype}</div>
+              <div>IMDb ID: {tconst}</div>
             </div>
           </details>
         </article>
                 """.rstrip()
-            )
-        section = f"""
+        )
+    return cards
+
+
+def _init_year_worker(groups: dict[int, pd.DataFrame], empty: pd.DataFrame) -> None:
+    global _worker_groups, _worker_empty
+    _worker_groups = groups
+    _worker_empty = empty
+
+
+def _run_year_task(task: tuple[Callable, int]):
+    render, year = task
+    return render(year_frame(_worker_groups, _worker_empty, year))
+
+
+def map_years(
+    render: Callable,
+    pipeline: Pipeline,
+    years: Iterable[int],
+) -> Iterator[tuple[int, Any]]:
+    years_list = list(years)
+    groups = pipeline.groups
+    empty = pipeline.corpus.iloc[0:0]
+    rows = sum(len(groups[year]) for year in years_list if year in groups)
+    workers = min(os.cpu_count() or 1, len(years_list))
+    if workers <= 1 or rows < PARALLEL_RENDER_MIN_ROWS:
+        for year in years_list:
+            yield year, render(year_frame(groups, empty, year))
+        return
+    tasks = [(render, year) for year in years_list]
+    # Forking after Arrow has started its thread pool can hang,
+    # so workers come from a clean forkserver (or spawn) process instead.
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_year_worker,
+        initargs=(groups, empty),
+    ) as ex:
+        yield from zip(years_list, ex.map(_run_year_task, tasks))
+
+
+def build_year_lines(df: pd.DataFrame) -> list[str]:
+    if df.empty:
+        return ["  (no titles)", ""]
+    return format_movie_lines(df) + [""]
+
+
+def render_text(pipeline: Pipeline, f: TextIO) -> None:
+    sections = map_years(build_year_lines, pipeline, pipeline.years)
+    for index, (year, lines) in enumerate(sections):
+        print(f"Processing {year}...")
+        if index:
+            f.write("\n")
+        f.write("\n".join([str(year)] + lines))
+
+
+def year_title_count(groups: dict[int, pd.DataFrame], year: int) -> int:
+    return len(groups.get(year, ()))
+
+
+def write_html_year_section(f: TextIO, year: int, cards: list[str]) -> None:
+    f.write(
+        f"""
       <section class="year-section" id="year-{year}">
         <div class="year-title">
           <h2>{year}</h2>
-          <span>{len(df)} titles</span>
+          <span>{len(cards)} titles</span>
         </div>
         <div class="grid">
-          {''.join(cards)}
+          """
+    )
+    f.writelines(cards)
+    f.write(
+        """
         </div>
-      </section>
-        """.rstrip()
-        sections.append(section)
+      </section>"""
+    )
+
+
+def render_html(pipeline: Pipeline, f: TextIO) -> None:
+    years_list = pipeline.years
+    title_type = pipeline.title_type
+    limit_per_year = pipeline.limit_per_year
+    title = f"{years_list[0]}-{years_list[-1]} {title_type.title()}s"
+    filters = []
+    filters.append(f"Min votes: {pipeline.min_votes}")
+    filters.append(f"Min rating: {pipeline.min_rating}")
+    if pipeline.include_genres:
+        filters.append(f"Include genres: {', '.join(pipeline.include_genres)}")
+    if pipeline.exclude_genres:
+        filters.append(f"Exclude genres: {', '.join(pipeline.exclude_genres)}")
+    if pipeline.min_runtime is not None or pipeline.max_runtime is not None:
+        min_r = pipeline.min_runtime if pipeline.min_runtime is not None else 0
+        max_r = pipeline.max_runtime if pipeline.max_runtime is not None else "any"
+        filters.append(f"Runtime: {min_r}-{max_r} min")
+    filters.append(f"Sort by: {pipeline.sort_by}")
+    if limit_per_year:
+        filters.append(f"Limit per year: {limit_per_year}")
+
+    counts = {year: year_title_count(pipeline.groups, year) for year in years_list}
+    years_with_titles = [year for year in years_list if counts[year]]
+    total_titles = sum(counts.values())
 
     subtitle = " | ".join(filters)
     if years_with_titles:
@@ -544,53 +796,59 @@ def build_html_page(
       </div>
     </section>
     """.rstrip()
-    body = "\n".join(sections) if sections else "<p>No titles matched your filters.</p>"
-    footer = build_html_footer(dt.datetime.now().strftime("%Y-%m-%d %H:%M"))
-    back_to_top = '<a class="back-to-top" href="#top">Back to top</a>'
-    return header + meta + body + back_to_top + footer
+    f.write(header)
+    f.write(meta)
+    if not years_with_titles:
+        f.write("<p>No titles matched your filters.</p>")
+    year_cards = map_years(build_movie_cards, pipeline, years_with_titles)
+    for index, (year, cards) in enumerate(year_cards):
+        if index:
+            f.write("\n")
+        write_html_year_section(f, year, cards)
+    f.write('<a class="back-to-top" href="#top">Back to top</a>')
+    f.write(build_html_footer(dt.datetime.now().strftime("%Y-%m-%d %H:%M")))
+
+
+def concat_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    total = sum(len(df) for df in frames)
+    out = {}
+    for col in frames[0].columns:
+        dtype = frames[0][col].dtype
+        if isinstance(dtype, np.dtype):
+            values = np.empty(total, dtype=dtype)
+            offset = 0
+            for df in frames:
+                values[offset:offset + len(df)] = df[col].to_numpy()
+                offset += len(df)
+        else:
+            # Extension columns (Arrow strings, categoricals, nullable ints)
+            # are joined natively rather than boxed into an object array.
+            arrays = [df[col].array for df in frames]
+            values = type(arrays[0])._concat_same_type(arrays)
+        out[col] = values
+    return pd.DataFrame(out)
+
+
+def write_csv(df: pd.DataFrame, path: str) -> None:
+    if pl is None:
+        df.to_csv(path, index=False)
+        return
+    # Polars quotes empty strings to tell them apart from nulls; pandas wrote
+    # both as empty fields, so blank strings are nulled first.
+    frame = pl.from_pandas(df)
+    frame.with_columns(pl.col(pl.String).replace("", None)).write_csv(path)
 
 
-def collect_rows(
-    basics: pd.DataFrame,
-    ratings: pd.DataFrame,
-    years: Iterable[int],
-    min_votes: int,
-    min_rating: float,
-    title_type: str,
-    include_genres: list[str],
-    exclude_genres: list[str],
-    min_runtime: int | None,
-    max_runtime: int | None,
-    sort_by: str,
-    limit_per_year: int | None,
-) -> pd.DataFrame:
+def render_dataframe(pipeline: Pipeline) -> pd.DataFrame:
     frames = []
-    for year in years:
+    for year in pipeline.years:
         print(f"Processing {year}...")
-        df = filter_one_year(
-            basics,
-            ratings,
-            year=year,
-            min_votes=min_votes,
-            min_rating=min_rating,
-            title_type=title_type,
-            include_genres=include_genres,
-            exclude_genres=exclude_genres,
-            min_runtime=min_runtime,
-            max_runtime=max_runtime,
-            sort_by=sort_by,
-            limit_per_year=limit_per_year,
-        )
-        if not df.empty:
+        df = pipeline.groups.get(year)
+        if df is not None and not df.empty:
             frames.append(df)
     if not frames:
         return pd.DataFrame()
-    return pd.concat(frames, ignore_index=True)
-
-
-def write_output(lines: list[str], output_path: str) -> None:
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+    return concat_frames(frames)
 
 
 def resolve_years(
@@ -612,13 +870,20 @@ def parse_args():
     parser = argparse.ArgumentParser(
         description="Aggregate IMDb movies into a single text file."
     )
-    add_imdb_paths_args(parser)
-    add_year_range_args(parser)
-    add_last_n_years_arg(parser)
-    add_filter_args(parser)
-    add_runtime_args(parser)
-    add_sort_format_args(parser)
-    add_title_type_arg(parser)
+    add_arg_groups(
+        parser,
+        [
+            "paths",
+            "year_range",
+            "last_n_years",
+            "filter",
+            "runtime",
+            "sort_format",
+            "title_type",
+            "cache",
+            "engine",
+        ],
+    )
     parser.add_argument("--output", default="movies_by_year.txt", help="Output text file")
     return parser.parse_args()
 
@@ -626,86 +891,58 @@ def parse_args():
 def main():
     args = parse_args()
 
-    basics, ratings = load_data(args.basics_path, args.ratings_path)
     try:
         years = resolve_years(args.start_year, args.end_year, args.last_n_years)
     except ValueError as exc:
         raise SystemExit(str(exc)) from exc
-    include_genres = parse_genre_list(args.include_genres)
-    exclude_genres = parse_genre_list(args.exclude_genres)
-    if args.genre:
-        include_genres.append(args.genre)
-
-    if args.format == "text":
-        out_lines = build_output(
-            basics,
-            ratings,
-            years=years,
-            min_votes=args.min_votes,
-            min_rating=args.min_rating,
-            title_type=args.title_type,
-            include_genres=include_genres,
-            exclude_genres=exclude_genres,
-            min_runtime=args.min_runtime,
-            max_runtime=args.max_runtime,
-            sort_by=args.sort_by,
-            limit_per_year=args.limit_per_year,
-        )
-        write_output(out_lines, args.output)
-        print(f"Done. Wrote {args.output}")
-        return
-
-    if args.format == "html":
-        html_page = build_html_page(
-            basics,
-            ratings,
-            years=years,
-            min_votes=args.min_votes,
-            min_rating=args.min_rating,
-            title_type=args.title_type,
-            include_genres=include_genres,
-            exclude_genres=exclude_genres,
-            min_runtime=args.min_runtime,
-            max_runtime=args.max_runtime,
-            sort_by=args.sort_by,
-            limit_per_year=args.limit_per_year,
-        )
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(html_page)
-        print(f"Done. Wrote {args.output}")
-        return
+    titles = load_titles(
+        args.basics_path,
+        args.ratings_path,
+        use_cache=args.cache,
+        engine=args.engine,
+        predicate=build_filter_expr(args, years) if args.engine == "polars" else None,
+        row_filters=build_arrow_filters(args, years) if args.engine == "pyarrow" else None,
+    )
+    include_genres, exclude_genres = parse_genre_names(args)
+    include_mask, exclude_mask = parse_genre_args(args)
 
-    df = collect_rows(
-        basics,
-        ratings,
+    pipeline = build_pipeline(
+        titles,
         years=years,
         min_votes=args.min_votes,
         min_rating=args.min_rating,
         title_type=args.title_type,
         include_genres=include_genres,
         exclude_genres=exclude_genres,
+        include_mask=include_mask,
+        exclude_mask=exclude_mask,
         min_runtime=args.min_runtime,
         max_runtime=args.max_runtime,
         sort_by=args.sort_by,
         limit_per_year=args.limit_per_year,
     )
-    columns = [
-        "tconst",
-        "primaryTitle",
-        "startYear",
-        "averageRating",
-        "numVotes",
-        "genres",
-        "runtimeMinutes",
-        "titleType",
-    ]
+
+    if args.format == "text":
+        with open(args.output, "w", encoding="utf-8", buffering=1 << 20) as f:
+            render_text(pipeline, f)
+        print(f"Done. Wrote {args.output}")
+        return
+
+    if args.format == "html":
+        with open(args.output, "w", encoding="utf-8", buffering=1 << 20) as f:
+            render_html(pipeline, f)
+        print(f"Done. Wrote {args.output}")
+        return
+
+    df = render_dataframe(pipeline)
+    columns = OUTPUT_COLUMNS
     if df.empty:
         df = pd.DataFrame(columns=columns)
     else:
         columns = [col for col in columns if col in df.columns]
-        df = df[columns]
+        df = df[columns].assign(tconst=format_tconst(df["tconst"]))
     if args.format == "csv":
-        df.to_csv(args.output, index=False)
+        write_csv(df, args.output)
     else:
         df.to_json(args.output, orient="records", indent=2)
     print(f"Done. Wrote {args.output}")
@@ -1,77 +1,692 @@
 #!/usr/bin/env python3
 import argparse
+import csv
+import functools
+import gzip
+import os
+import secrets
 from pathlib import Path
+from typing import BinaryIO, Callable
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
+from pyarrow import parquet as pq
 
+try:
+    import polars as pl
+except ImportError:
+    pl = None
 
-def read_tsv_auto(path: str) -> pd.DataFrame:
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
+try:
+    from isal import igzip
+except ImportError:
+    igzip = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ENGINES = ["pyarrow", "polars", "pandas"]
+
+READ_BUFFER_SIZE = 128 * 1024
+SIDECAR_SOURCE_KEY = b"imdb_toolkit.source"
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"\x28\xb5\x2f\xfd": "zstd",
+    b"BZh": "bz2",
+}
+
+USECOLS_BASICS = ["tconst", "titleType", "primaryTitle", "startYear", "genres", "runtimeMinutes"]
+USECOLS_RATINGS = ["tconst", "averageRating", "numVotes"]
+BASICS_DTYPES = {
+    "tconst": "int32",
+    "titleType": "category",
+    "primaryTitle": "string[pyarrow]",
+    "originalTitle": "string[pyarrow]",
+    "isAdult": "Int8",
+    "startYear": "Int16",
+    "endYear": "Int16",
+    "runtimeMinutes": "Int32",
+    "genres": "string[pyarrow]",
+}
+RATINGS_DTYPES = {
+    "tconst": "int32",
+    "averageRating": "float64",
+    "numVotes": "Int32",
+}
+IMDB_GENRES = [
+    "Action",
+    "Adult",
+    "Adventure",
+    "Animation",
+    "Biography",
+    "Comedy",
+    "Crime",
+    "Documentary",
+    "Drama",
+    "Family",
+    "Fantasy",
+    "Film-Noir",
+    "Game-Show",
+    "History",
+    "Horror",
+    "Music",
+    "Musical",
+    "Mystery",
+    "News",
+    "Reality-TV",
+    "Romance",
+    "Sci-Fi",
+    "Short",
+    "Sport",
+    "Talk-Show",
+    "Thriller",
+    "War",
+    "Western",
+]
+GENRE_BITS = {genre.lower(): 1 << bit for bit, genre in enumerate(IMDB_GENRES)}
+TSV_COLUMN_TYPES = {
+    "startYear": pa.string(),
+    "runtimeMinutes": pa.string(),
+    "averageRating": pa.float64(),
+    "numVotes": pa.int32(),
+}
+# Read as text and cast leniently, so a stray non-numeric value becomes null
+# instead of failing the whole file.
+LENIENT_INT_COLUMNS = {
+    "startYear": (pa.int16(), r"^\d{1,4}$"),
+    "runtimeMinutes": (pa.int32(), r"^\d{1,9}$"),
+}
+
+
+def read_tsv_auto(
+    path: str,
+    usecols: list[str] | None = None,
+    engine: str = "pyarrow",
+    dtypes: dict[str, str] | None = None,
+    cache: bool = False,
+) -> pd.DataFrame:
+    # Repeated reads in one process share the parsed frame; the shallow copy
+    # keeps callers' column assignments from reaching the memoised one.
+    stat = os.stat(path)
+    df = _read_tsv_memo(
+        os.path.abspath(path),
+        stat.st_mtime_ns,
+        stat.st_size,
+        tuple(usecols) if usecols else None,
+        engine,
+        tuple(dtypes.items()) if dtypes else None,
+        cache,
+    )
+    return df.copy(deep=False)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_tsv_memo(
+    path: str,
+    mtime_ns: int,
+    size: int,
+    usecols: tuple[str, ...] | None,
+    engine: str,
+    dtypes: tuple[tuple[str, str], ...] | None,
+    cache: bool,
+) -> pd.DataFrame:
+    columns = list(usecols) if usecols else None
+    return _read_tsv_cached(path, columns, engine, dict(dtypes or ()), cache)
+
+
+def _read_tsv_cached(
+    path: str,
+    usecols: list[str] | None,
+    engine: str,
+    dtypes: dict[str, str],
+    cache: bool,
+) -> pd.DataFrame:
+    sidecar = tsv_sidecar_path(path) if cache else None
+    if sidecar is not None and sidecar_is_fresh(sidecar, path, usecols):
+        return decode_tconst(pd.read_parquet(sidecar, columns=usecols, memory_map=True))
+    # Stamp the source before reading it, so a file replaced mid-read is
+    # picked up again next time.
+    stamp = source_stamp(path) if sidecar is not None else None
+    df = _read_tsv(path, usecols, engine, dtypes)
+    if sidecar is not None:
+        try:
+            write_parquet_atomic(df, sidecar, {SIDECAR_SOURCE_KEY: stamp})
+        except OSError:
+            pass
+    return df
+
+
+def write_parquet_atomic(
+    df: pd.DataFrame,
+    path: Path,
+    metadata: dict[bytes, bytes] | None = None,
+) -> None:
+    table = pa.Table.from_pandas(df)
+    if metadata:
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+    # A unique temporary name keeps concurrent writers from clobbering each
+    # other's half-written file before the rename. Creating it with 0666 lets
+    # the umask decide the cache file's mode, as a plain open() would.
+    tmp_path = path.with_name(f"{path.name}.{secrets.token_hex(8)}.tmp")
+    os.close(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+    try:
+        pq.write_table(table, tmp_path, compression="zstd", use_dictionary=True)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def tsv_sidecar_path(path: str) -> Path:
     p = Path(path)
-    if p.suffix == ".gz":
-        return pd.read_csv(path, sep="\t", na_values="\\N", compression="gzip", low_memory=False)
-    return pd.read_csv(path, sep="\t", na_values="\\N", low_memory=False)
+    return p.with_suffix(p.suffix + ".parquet")
 
 
-def add_imdb_paths_args(parser: argparse.ArgumentParser) -> None:
-    parser.add_argument("--basics-path", required=True, help="Path to title.basics.tsv or .tsv.gz")
-    parser.add_argument("--ratings-path", required=True, help="Path to title.ratings.tsv or .tsv.gz")
+def source_stamp(path: str) -> bytes:
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}".encode()
 
 
-def add_filter_args(parser: argparse.ArgumentParser) -> None:
-    parser.add_argument("--min-votes", type=int, default=500, help="Minimum votes (default 500)")
-    parser.add_argument("--min-rating", type=float, default=6.5, help="Minimum rating (default 6.5)")
-    parser.add_argument("--genre", help="Optional genre filter (single value, case-insensitive)")
-    parser.add_argument(
-        "--include-genres",
-        help="Comma-separated list; keep titles matching ANY of these genres",
+def sidecar_is_fresh(sidecar: Path, path: str, usecols: list[str] | None) -> bool:
+    # Downloads and copies can keep an older mtime than the sidecar, so only
+    # an exact match with the source it was built from counts as fresh.
+    if usecols is None or not sidecar.exists():
+        return False
+    try:
+        schema = pq.read_schema(sidecar)
+    except (OSError, pa.ArrowInvalid):
+        # Unreadable or truncated sidecars are rebuilt like stale ones.
+        return False
+    if (schema.metadata or {}).get(SIDECAR_SOURCE_KEY) != source_stamp(path):
+        return False
+    return all(col in schema.names for col in usecols)
+
+
+def _read_tsv(
+    path: str,
+    usecols: list[str] | None,
+    engine: str,
+    dtypes: dict[str, str] | None,
+) -> pd.DataFrame:
+    if engine == "pandas":
+        return _read_tsv_pandas(path, usecols, dtypes)
+    if engine == "polars":
+        return apply_dtypes(_read_tsv_polars(path, usecols), dtypes)
+    table = read_tsv_table(path, usecols)
+    return apply_dtypes(table.to_pandas(types_mapper=pd.ArrowDtype), dtypes)
+
+
+def read_tsv_table(
+    path: str,
+    usecols: list[str] | None = None,
+    filter_expr: pc.Expression | None = None,
+    block_size: int = 8 << 20,
+) -> pa.Table:
+    ragged_rows = []
+
+    def stop_on_ragged_row(row: pacsv.InvalidRow) -> str:
+        ragged_rows.append(row.number)
+        return "error"
+
+    try:
+        return _read_tsv_table_arrow(path, usecols, filter_expr, block_size, stop_on_ragged_row)
+    except pa.ArrowInvalid:
+        if not ragged_rows:
+            raise
+    # Arrow can only skip or reject a row with the wrong number of fields.
+    # Like the polars and pandas readers, pad short rows with nulls and drop
+    # the surplus fields of long ones, via the pandas reader.
+    table = _read_tsv_table_pandas(path, usecols)
+    return table if filter_expr is None else table.filter(filter_expr)
+
+
+def _read_tsv_table_arrow(
+    path: str,
+    usecols: list[str] | None,
+    filter_expr: pc.Expression | None,
+    block_size: int,
+    invalid_row_handler: Callable[[pacsv.InvalidRow], str],
+) -> pa.Table:
+    if filter_expr is None:
+        read_options, parse_options, convert_options = _arrow_csv_options(
+            usecols, invalid_row_handler=invalid_row_handler
+        )
+        with _open_tsv_source(path) as source:
+            table = pacsv.read_csv(
+                source,
+                read_options=read_options,
+                parse_options=parse_options,
+                convert_options=convert_options,
+            )
+        return decode_tconst_table(coerce_lenient_ints(table))
+    read_options, parse_options, convert_options = _arrow_csv_options(
+        usecols, block_size, invalid_row_handler
+    )
+    with _open_tsv_source(path) as source:
+        reader = pacsv.open_csv(
+            source,
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=convert_options,
+        )
+        parts = [coerce_lenient_ints(batch).filter(filter_expr) for batch in reader]
+    schema = coerce_lenient_ints(reader.schema.empty_table()).schema
+    return decode_tconst_table(pa.Table.from_batches(parts, schema=schema))
+
+
+def _read_tsv_table_pandas(path: str, usecols: list[str] | None) -> pa.Table:
+    table = pa.Table.from_pandas(_read_tsv_pandas(path, usecols, None), preserve_index=False)
+    types = {"tconst": pa.int32(), **TSV_COLUMN_TYPES}
+    types.update((name, int_type) for name, (int_type, _) in LENIENT_INT_COLUMNS.items())
+    schema = pa.schema([(name, types.get(name, pa.string())) for name in table.column_names])
+    return table.cast(schema)
+
+
+def coerce_lenient_ints(data: pa.Table | pa.RecordBatch) -> pa.Table | pa.RecordBatch:
+    for name, (int_type, pattern) in LENIENT_INT_COLUMNS.items():
+        index = data.schema.get_field_index(name)
+        if index < 0:
+            continue
+        values = data.column(index)
+        numeric = pc.match_substring_regex(values, pattern)
+        values = pc.if_else(numeric, values, pa.scalar(None, pa.string()))
+        data = data.set_column(index, name, pc.cast(values, int_type))
+    return data
+
+
+def decode_tconst_table(table: pa.Table) -> pa.Table:
+    if "tconst" not in table.column_names:
+        return table
+    index = table.column_names.index("tconst")
+    tids = pc.cast(pc.utf8_slice_codeunits(table["tconst"], 2), pa.int32())
+    return table.set_column(index, "tconst", tids)
+
+
+def decode_tconst(df: pd.DataFrame) -> pd.DataFrame:
+    # IMDb ids are "tt" plus at most 8 digits, so they fit an int32 join key.
+    if "tconst" in df.columns and not pd.api.types.is_integer_dtype(df["tconst"]):
+        df["tconst"] = df["tconst"].str.slice(2).astype("int32")
+    return df
+
+
+def decode_tid(tid: int) -> str:
+    return f"tt{tid:07d}"
+
+
+def read_and_filter_tsv(
+    path: str,
+    filter_expr: pc.Expression,
+    usecols: list[str] | None = None,
+    dtypes: dict[str, str] | None = None,
+    block_size: int = 8 << 20,
+) -> pd.DataFrame:
+    table = read_tsv_table(path, usecols, filter_expr, block_size)
+    return apply_dtypes(table.to_pandas(types_mapper=pd.ArrowDtype), dtypes)
+
+
+def read_ratings(
+    path: str,
+    engine: str = "pyarrow",
+    cache: bool = False,
+    filter_expr: pc.Expression | None = None,
+) -> dict[str, np.ndarray]:
+    # Titles without a vote count or rating can never pass the row filters,
+    # and the arrays below have no room for missing values.
+    if engine == "pyarrow" and not cache:
+        table = read_tsv_table(path, USECOLS_RATINGS, filter_expr).drop_null()
+        return {
+            "tconst": table["tconst"].to_numpy(),
+            "averageRating": table["averageRating"].to_numpy(),
+            "numVotes": table["numVotes"].to_numpy(),
+        }
+    df = read_tsv_auto(path, usecols=USECOLS_RATINGS, engine=engine, dtypes=RATINGS_DTYPES, cache=cache)
+    df = df.dropna(subset=["averageRating", "numVotes"])
+    return {
+        "tconst": df["tconst"].to_numpy(dtype=np.int32),
+        "averageRating": df["averageRating"].to_numpy(dtype=np.float64),
+        "numVotes": df["numVotes"].to_numpy(dtype=np.int32),
+    }
+
+
+def _arrow_csv_options(
+    usecols: list[str] | None,
+    block_size: int | None = None,
+    invalid_row_handler: Callable[[pacsv.InvalidRow], str] | None = None,
+) -> tuple[pacsv.ReadOptions, pacsv.ParseOptions, pacsv.ConvertOptions]:
+    read_options = pacsv.ReadOptions(use_threads=True, block_size=block_size)
+    parse_options = pacsv.ParseOptions(
+        delimiter="\t",
+        quote_char=False,
+        invalid_row_handler=invalid_row_handler,
     )
-    parser.add_argument(
-        "--exclude-genres",
-        help="Comma-separated list; drop titles matching ANY of these genres",
+    convert_options = pacsv.ConvertOptions(
+        include_columns=usecols or [],
+        column_types=TSV_COLUMN_TYPES,
+        null_values=["\\N", ""],
+        strings_can_be_null=True,
     )
+    return read_options, parse_options, convert_options
 
 
-def add_runtime_args(parser: argparse.ArgumentParser) -> None:
-    parser.add_argument("--min-runtime", type=int, help="Minimum runtime in minutes")
-    parser.add_argument("--max-runtime", type=int, help="Maximum runtime in minutes")
+def _open_tsv_source(path: str) -> BinaryIO:
+    # Always hand pyarrow a stream: given a path it would guess the
+    # compression from the suffix again.
+    compression = detect_compression(path)
+    if compression == "gzip" and has_fast_gzip():
+        return open_gzip(path)
+    return pa.input_stream(path, compression=compression, buffer_size=READ_BUFFER_SIZE)
 
 
-def add_sort_format_args(parser: argparse.ArgumentParser) -> None:
-    parser.add_argument(
-        "--sort-by",
-        default="rating",
-        choices=["rating", "votes", "title"],
-        help="Sort within each year (default rating)",
+def apply_dtypes(df: pd.DataFrame, dtypes: dict[str, str] | None) -> pd.DataFrame:
+    if not dtypes:
+        return df
+    return df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns})
+
+
+def detect_compression(path: str) -> str | None:
+    with open(path, "rb") as fh:
+        head = fh.read(4)
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_tsv(path: str) -> BinaryIO:
+    compression = detect_compression(path)
+    if compression == "gzip":
+        return open_gzip(path)
+    if compression == "zstd" and zstandard is not None:
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    if compression is not None:
+        return pa.input_stream(path, compression=compression, buffer_size=READ_BUFFER_SIZE)
+    return open(path, "rb", buffering=READ_BUFFER_SIZE)
+
+
+def has_fast_gzip() -> bool:
+    return rapidgzip is not None or igzip is not None
+
+
+def open_gzip(path: str) -> BinaryIO:
+    if rapidgzip is not None:
+        return rapidgzip.open(path, parallelization=os.cpu_count() or 1)
+    if igzip is not None:
+        return igzip.open(path, "rb")
+    return gzip.open(path, "rb")
+
+
+def _require_polars() -> None:
+    if pl is None:
+        raise ImportError("--engine polars requires the polars package")
+
+
+def scan_tsv(path: str, usecols: list[str] | None = None) -> "pl.LazyFrame":
+    _require_polars()
+    options = dict(
+        separator="\t",
+        quote_char=None,
+        null_values=["\\N", ""],
+        schema_overrides={
+            "startYear": pl.String,
+            "runtimeMinutes": pl.String,
+            "averageRating": pl.Float64,
+            "numVotes": pl.Int32,
+        },
+        infer_schema_length=10000,
+        truncate_ragged_lines=True,
     )
-    parser.add_argument(
-        "--format",
-        default="text",
-        choices=["text", "csv", "json", "html"],
-        help="Output format (default text)",
+    # Polars sniffs gzip and zstd itself but has no bzip2 reader.
+    if detect_compression(path) == "bz2":
+        with open_tsv(path) as fh:
+            lf = pl.read_csv(fh, columns=usecols, **options).lazy()
+    else:
+        lf = pl.scan_csv(path, **options)
+    if usecols:
+        lf = lf.select(usecols)
+    names = lf.collect_schema().names()
+    lenient = {"startYear": pl.Int16, "runtimeMinutes": pl.Int32}
+    lf = lf.with_columns(
+        pl.col(name).cast(dtype, strict=False) for name, dtype in lenient.items() if name in names
     )
-    parser.add_argument(
-        "--limit-per-year",
-        type=int,
-        help="Maximum number of rows per year (default no limit)",
+    if "tconst" in names:
+        lf = lf.with_columns(pl.col("tconst").str.slice(2).cast(pl.Int32))
+    return lf
+
+
+def _read_tsv_polars(path: str, usecols: list[str] | None) -> pd.DataFrame:
+    df = scan_tsv(path, usecols).collect()
+    return df.to_pandas(use_pyarrow_extension_array=True)
+
+
+def _read_tsv_pandas(
+    path: str,
+    usecols: list[str] | None,
+    dtypes: dict[str, str] | None,
+) -> pd.DataFrame:
+    text_columns = {"tconst", *LENIENT_INT_COLUMNS}
+    dtype = {**(dtypes or {}), **{col: "string[pyarrow]" for col in text_columns}}
+    if usecols:
+        dtype = {col: dtype[col] for col in usecols if col in dtype}
+    options = dict(
+        sep="\t",
+        na_values=["\\N", ""],
+        keep_default_na=False,
+        quoting=csv.QUOTE_NONE,
+        # Naming the columns makes the C parser drop the surplus fields of
+        # long rows instead of rejecting them; short rows are padded.
+        usecols=usecols or (lambda name: True),
+        dtype=dtype,
+        engine="c",
     )
+    with open_tsv(path) as fh:
+        df = pd.read_csv(fh, **options)
+    for col, (int_type, pattern) in LENIENT_INT_COLUMNS.items():
+        if col in df.columns:
+            numeric = df[col].str.match(pattern).fillna(False).astype(bool)
+            target = (dtypes or {}).get(col, pd.ArrowDtype(int_type))
+            df[col] = df[col].where(numeric).astype(target)
+    return decode_tconst(df)
 
 
-def add_title_type_arg(parser: argparse.ArgumentParser) -> None:
-    parser.add_argument(
-        "--title-type",
-        default="movie",
-        help="IMDb titleType to include (default movie)",
+def parse_genre_list(value: str | None) -> list[str]:
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_genre_names(args: argparse.Namespace) -> tuple[list[str], list[str]]:
+    include_genres = parse_genre_list(args.include_genres)
+    exclude_genres = parse_genre_list(args.exclude_genres)
+    if args.genre:
+        include_genres.append(args.genre)
+    return include_genres, exclude_genres
+
+
+def genre_mask(genres: list[str]) -> int:
+    mask = 0
+    for genre in genres:
+        mask |= GENRE_BITS.get(genre.strip().lower(), 0)
+    return mask
+
+
+def parse_genre_args(args: argparse.Namespace) -> tuple[int | None, int]:
+    include_genres, exclude_genres = parse_genre_names(args)
+    include_mask = genre_mask(include_genres) if include_genres else None
+    return include_mask, genre_mask(exclude_genres)
+
+
+def build_filter_expr(args: argparse.Namespace, years: range) -> "pl.Expr":
+    _require_polars()
+    include_genres, exclude_genres = parse_genre_names(args)
+    expr = (
+        (pl.col("titleType") == args.title_type)
+        & pl.col("startYear").is_between(years[0], years[-1])
+        & (pl.col("numVotes") >= args.min_votes)
+        & (pl.col("averageRating") >= args.min_rating)
     )
+    if args.min_runtime is not None:
+        expr &= pl.col("runtimeMinutes") >= args.min_runtime
+    if args.max_runtime is not None:
+        expr &= pl.col("runtimeMinutes") <= args.max_runtime
+    genres = pl.col("genres").fill_null("").str.to_lowercase().str.split(",")
+    if include_genres:
+        expr &= pl.any_horizontal([genres.list.contains(g.strip().lower()) for g in include_genres])
+    for genre in exclude_genres:
+        expr &= ~genres.list.contains(genre.strip().lower())
+    return expr
 
 
-def add_last_n_years_arg(parser: argparse.ArgumentParser) -> None:
-    parser.add_argument(
-        "--last-n-years",
-        type=int,
-        help="Override start/end years to include only the most recent N years",
+def build_arrow_filters(
+    args: argparse.Namespace,
+    years: range,
+) -> tuple[pc.Expression, pc.Expression]:
+    basics_expr = (
+        (pc.field("titleType") == args.title_type)
+        & (pc.field("startYear") >= years[0])
+        & (pc.field("startYear") <= years[-1])
     )
+    if args.min_runtime is not None:
+        basics_expr &= pc.field("runtimeMinutes") >= args.min_runtime
+    if args.max_runtime is not None:
+        basics_expr &= pc.field("runtimeMinutes") <= args.max_runtime
+    ratings_expr = (pc.field("numVotes") >= args.min_votes) & (
+        pc.field("averageRating") >= args.min_rating
+    )
+    return basics_expr, ratings_expr
+
+
+_ARG_SPECS: dict[str, list[tuple[str, dict]]] = {
+    "paths": [
+        (
+            "--basics-path",
+            dict(required=True, help="Path to title.basics.tsv, plain or gzip/bzip2/zstd"),
+        ),
+        (
+            "--ratings-path",
+            dict(required=True, help="Path to title.ratings.tsv, plain or gzip/bzip2/zstd"),
+        ),
+    ],
+    "year_range": [
+        ("--start-year", dict(type=int, default=2000, help="First year (default 2000)")),
+        ("--end-year", dict(type=int, default=2025, help="Last year inclusive (default 2025)")),
+    ],
+    "last_n_years": [
+        (
+            "--last-n-years",
+            dict(type=int, help="Override start/end years to include only the most recent N years"),
+        ),
+    ],
+    "filter": [
+        ("--min-votes", dict(type=int, default=500, help="Minimum votes (default 500)")),
+        ("--min-rating", dict(type=float, default=6.5, help="Minimum rating (default 6.5)")),
+        ("--genre", dict(help="Optional genre filter (single value, case-insensitive)")),
+        (
+            "--include-genres",
+            dict(help="Comma-separated list; keep titles matching ANY of these genres"),
+        ),
+        (
+            "--exclude-genres",
+            dict(help="Comma-separated list; drop titles matching ANY of these genres"),
+        ),
+    ],
+    "runtime": [
+        ("--min-runtime", dict(type=int, help="Minimum runtime in minutes")),
+        ("--max-runtime", dict(type=int, help="Maximum runtime in minutes")),
+    ],
+    "sort_format": [
+        (
+            "--sort-by",
+            dict(
+                default="rating",
+                choices=["rating", "votes", "title"],
+                help="Sort within each year (default rating)",
+            ),
+        ),
+        (
+            "--format",
+            dict(
+                default="text",
+                choices=["text", "csv", "json", "html"],
+                help="Output format (default text)",
+            ),
+        ),
+        (
+            "--limit-per-year",
+            dict(type=int, help="Maximum number of rows per year (default no limit)"),
+        ),
+    ],
+    "title_type": [
+        ("--title-type", dict(default="movie", help="IMDb titleType to include (default movie)")),
+    ],
+    "cache": [
+        (
+            "--cache",
+            dict(
+                action=argparse.BooleanOptionalAction,
+                default=False,
+                help=(
+                    "Cache parsed TSVs as .parquet sidecars and the merged data "
+                    "under ~/.cache/imdb_toolkit (default off)"
+                ),
+            ),
+        ),
+    ],
+    "engine": [
+        (
+            "--engine",
+            dict(default="pyarrow", choices=ENGINES, help="TSV reader to use (default pyarrow)"),
+        ),
+    ],
+}
+
+
+def add_arg_groups(parser: argparse.ArgumentParser, groups: list[str]) -> None:
+    for group in groups:
+        for flag, kwargs in _ARG_SPECS[group]:
+            parser.add_argument(flag, **kwargs)
+
+
+def add_imdb_paths_args(parser: argparse.ArgumentParser) -> None:
+    add_arg_groups(parser, ["paths"])
+
+
+def add_filter_args(parser: argparse.ArgumentParser) -> None:
+    add_arg_groups(parser, ["filter"])
+
+
+def add_runtime_args(parser: argparse.ArgumentParser) -> None:
+    add_arg_groups(parser, ["runtime"])
+
+
+def add_sort_format_args(parser: argparse.ArgumentParser) -> None:
+    add_arg_groups(parser, ["sort_format"])
+
+
+def add_title_type_arg(parser: argparse.ArgumentParser) -> None:
+    add_arg_groups(parser, ["title_type"])
+
+
+def add_last_n_years_arg(parser: argparse.ArgumentParser) -> None:
+    add_arg_groups(parser, ["last_n_years"])
 
 
 def add_year_range_args(parser: argparse.ArgumentParser) -> None:
-    parser.add_argument("--start-year", type=int, default=2000, help="First year (default 2000)")
-    parser.add_argument("--end-year", type=int, default=2025, help="Last year inclusive (default 2025)")
+    add_arg_groups(parser, ["year_range"])
+
+
+def add_cache_arg(parser: argparse.ArgumentParser) -> None:
+    add_arg_groups(parser, ["cache"])
+
+
+def add_engine_arg(parser: argparse.ArgumentParser) -> None:
+    add_arg_groups(parser, ["engine"])
@@ -0,0 +1,186 @@
+import bz2
+import datetime as dt
+import gzip
+import importlib.util
+import shutil
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pytest
+
+import imdb_movie_toolkit
+import imdb_utils
+
+BASICS_ROWS = [
+    "tconst\ttitleType\tprimaryTitle\toriginalTitle\tisAdult\tstartYear\tendYear\truntimeMinutes\tgenres",
+    "tt0000001\tmovie\tAlpha\tAlpha\t0\t2001\t\\N\t100\tDrama",
+    "tt0000002\tmovie\tNone\tNone\t0\t2001\t\\N\t90\tComedy,Drama",
+    "tt0000003\tmovie\t\\N\t\\N\t0\t2001\t\\N\t95\tDrama",
+    "tt0000004\tmovie\tNo Year\tNo Year\t0\t20xx\t\\N\t80\tDrama",
+    "tt0000005\tmovie\tShort Row\tShort Row\t0\t2002",
+    "tt0000006\tmovie\tLong Row\tLong Row\t0\t2002\t\\N\t120\tAction\textra",
+    "tt0000007\tmovie\tNo Runtime\tNo Runtime\t0\t2002\t\\N\t\\N\tAction,Horror",
+    "tt0000008\tmovie\tOdd Runtime\tOdd Runtime\t0\t2003\t\\N\t1h30\tComedy",
+    "tt0000009\ttvSeries\tA Series\tA Series\t0\t2003\t2005\t45\tDrama",
+    "tt0000010\tmovie\tNA\tNA\t0\t2003\t\\N\t110\tAction,Drama",
+    "tt0000011\tmovie\tUnrated\tUnrated\t0\t2003\t\\N\t100\tDrama",
+]
+RATINGS_ROWS = [
+    "tconst\taverageRating\tnumVotes",
+    "tt0000001\t7.5\t1000",
+    "tt0000002\t7.5\t1000",
+    "tt0000003\t7.5\t1000",
+    "tt0000004\t8.0\t2000",
+    "tt0000005\t6.0\t300",
+    "tt0000006\t9.1\t5000",
+    "tt0000007\t5.5\t700",
+    "tt0000008\t7.0\t800",
+    "tt0000009\t8.5\t900",
+    "tt0000010\t7.5\t1000",
+    "tt0000011\t7.0\t\\N",
+]
+
+ENGINES = [
+    pytest.param(
+        engine,
+        marks=pytest.mark.skipif(
+            engine == "polars" and importlib.util.find_spec("polars") is None,
+            reason="polars is not installed",
+        ),
+    )
+    for engine in imdb_utils.ENGINES
+]
+
+
+def compress(data: bytes, compression: str | None) -> bytes:
+    if compression == "gzip":
+        return gzip.compress(data)
+    if compression == "bz2":
+        return bz2.compress(data)
+    if compression == "zstd":
+        return pa.compress(data, codec="zstd", asbytes=True)
+    return data
+
+
+def write_fixture(
+    directory: Path,
+    compression: str | None = None,
+    suffix: str = ".tsv",
+) -> tuple[Path, Path]:
+    directory.mkdir(parents=True)
+    paths = []
+    for name, rows in (("title.basics", BASICS_ROWS), ("title.ratings", RATINGS_ROWS)):
+        path = directory / f"{name}{suffix}"
+        path.write_bytes(compress(("\n".join(rows) + "\n").encode(), compression))
+        paths.append(path)
+    return paths[0], paths[1]
+
+
+def run_toolkit(monkeypatch, basics: Path, ratings: Path, output: Path, args: list[str]) -> str:
+    imdb_utils._read_tsv_memo.cache_clear()
+    argv = [
+        "imdb_movie_toolkit.py",
+        "--basics-path",
+        str(basics),
+        "--ratings-path",
+        str(ratings),
+        "--start-year",
+        "2000",
+        "--end-year",
+        "2003",
+        "--min-votes",
+        "0",
+        "--min-rating",
+        "0",
+        "--output",
+        str(output),
+        *args,
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    imdb_movie_toolkit.main()
+    return output.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("fmt", ["text", "csv", "json"])
+@pytest.mark.parametrize(
+    "filters",
+    [
+        [],
+        ["--min-runtime", "-10"],
+        ["--max-runtime", "-1"],
+        ["--min-runtime", "90", "--max-runtime", "110"],
+        ["--include-genres", "drama", "--exclude-genres", "comedy"],
+        ["--title-type", "tvSeries"],
+        ["--sort-by", "title"],
+    ],
+)
+def test_engines_and_caches_agree(tmp_path, monkeypatch, engine, fmt, filters):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    args = ["--format", fmt, *filters]
+    output = tmp_path / "out"
+
+    basics, ratings = write_fixture(tmp_path / "reference")
+    expected = run_toolkit(monkeypatch, basics, ratings, output, args)
+
+    basics, ratings = write_fixture(tmp_path / engine)
+    args += ["--engine", engine]
+    assert run_toolkit(monkeypatch, basics, ratings, output, args) == expected
+    # Cold run writes the sidecars and merged cache, the next reads the
+    # merged cache, and the last reads the sidecars alone.
+    assert run_toolkit(monkeypatch, basics, ratings, output, args + ["--cache"]) == expected
+    assert run_toolkit(monkeypatch, basics, ratings, output, args + ["--cache"]) == expected
+    shutil.rmtree(tmp_path / "home" / ".cache")
+    assert run_toolkit(monkeypatch, basics, ratings, output, args + ["--cache"]) == expected
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize(
+    "compression,suffix",
+    [
+        ("gzip", ".tsv"),
+        (None, ".tsv.gz"),
+        ("gzip", ".tsv.gz"),
+        ("bz2", ".tsv"),
+        pytest.param(
+            "zstd",
+            ".tsv.zst",
+            marks=pytest.mark.skipif(
+                not pa.Codec.is_available("zstd"), reason="zstd codec is not available"
+            ),
+        ),
+    ],
+)
+def test_compression_detected_from_contents(tmp_path, monkeypatch, engine, compression, suffix):
+    args = ["--format", "csv"]
+    output = tmp_path / "out"
+
+    basics, ratings = write_fixture(tmp_path / "reference")
+    expected = run_toolkit(monkeypatch, basics, ratings, output, args)
+
+    basics, ratings = write_fixture(tmp_path / engine, compression, suffix)
+    args += ["--engine", engine]
+    assert run_toolkit(monkeypatch, basics, ratings, output, args) == expected
+
+
+class FixedDatetime(dt.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 1, 1, 12, 0)
+
+
+@pytest.mark.parametrize("fmt", ["text", "html"])
+def test_parallel_render_matches_in_process(tmp_path, monkeypatch, fmt):
+    # Pin the HTML footer's timestamp so the two renders can be compared.
+    fixed_clock = SimpleNamespace(date=dt.date, datetime=FixedDatetime)
+    monkeypatch.setattr(imdb_movie_toolkit, "dt", fixed_clock)
+    args = ["--format", fmt]
+    output = tmp_path / "out"
+    basics, ratings = write_fixture(tmp_path / "data")
+    expected = run_toolkit(monkeypatch, basics, ratings, output, args)
+
+    monkeypatch.setattr(imdb_movie_toolkit, "PARALLEL_RENDER_MIN_ROWS", 0)
+    monkeypatch.setattr(imdb_movie_toolkit.os, "cpu_count", lambda: 2)
+    assert run_toolkit(monkeypatch, basics, ratings, output, args) == expected
@@ -0,0 +1,76 @@
+import os
+
+import pyarrow.parquet as pq
+import pytest
+
+import imdb_utils
+from imdb_utils import RATINGS_DTYPES, USECOLS_RATINGS
+
+RATINGS = "tconst\taverageRating\tnumVotes\ntt0000001\t7.5\t1000\ntt0000002\t6.0\t300\n"
+
+
+def read_ratings_cached(path, usecols=USECOLS_RATINGS):
+    imdb_utils._read_tsv_memo.cache_clear()
+    return imdb_utils.read_tsv_auto(str(path), usecols=usecols, dtypes=RATINGS_DTYPES, cache=True)
+
+
+def sidecar_stamp(path):
+    schema = pq.read_schema(imdb_utils.tsv_sidecar_path(str(path)))
+    return schema.metadata[imdb_utils.SIDECAR_SOURCE_KEY]
+
+
+@pytest.fixture
+def ratings_path(tmp_path):
+    path = tmp_path / "title.ratings.tsv"
+    path.write_text(RATINGS, encoding="utf-8")
+    return path
+
+
+def test_sidecar_is_written_with_the_source_stamp(ratings_path):
+    read_ratings_cached(ratings_path)
+    assert sidecar_stamp(ratings_path) == imdb_utils.source_stamp(str(ratings_path))
+
+
+def test_sidecar_from_a_different_size_is_rewritten(ratings_path):
+    read_ratings_cached(ratings_path)
+    ratings_path.write_text(RATINGS + "tt0000003\t8.0\t5000\n", encoding="utf-8")
+
+    df = read_ratings_cached(ratings_path)
+
+    assert df["numVotes"].tolist() == [1000, 300, 5000]
+    assert sidecar_stamp(ratings_path) == imdb_utils.source_stamp(str(ratings_path))
+
+
+def test_sidecar_from_a_different_mtime_is_rewritten(ratings_path):
+    read_ratings_cached(ratings_path)
+    # Same size, older mtime: a copied or re-downloaded file.
+    ratings_path.write_text(RATINGS.replace("7.5", "9.5"), encoding="utf-8")
+    stat = ratings_path.stat()
+    os.utime(ratings_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+
+    df = read_ratings_cached(ratings_path)
+
+    assert df["averageRating"].tolist() == [9.5, 6.0]
+    assert sidecar_stamp(ratings_path) == imdb_utils.source_stamp(str(ratings_path))
+
+
+def test_truncated_sidecar_is_rebuilt(ratings_path):
+    expected = read_ratings_cached(ratings_path)
+    sidecar = imdb_utils.tsv_sidecar_path(str(ratings_path))
+    sidecar.write_bytes(sidecar.read_bytes()[: sidecar.stat().st_size // 2])
+
+    df = read_ratings_cached(ratings_path)
+
+    assert df.to_dict("list") == expected.to_dict("list")
+    assert sidecar_stamp(ratings_path) == imdb_utils.source_stamp(str(ratings_path))
+
+
+def test_sidecar_missing_a_requested_column_is_not_reused(ratings_path):
+    read_ratings_cached(ratings_path, usecols=["tconst", "averageRating"])
+
+    df = read_ratings_cached(ratings_path)
+
+    assert list(df.columns) == USECOLS_RATINGS
+    assert df["numVotes"].tolist() == [1000, 300]
+    schema = pq.read_schema(imdb_utils.tsv_sidecar_path(str(ratings_path)))
+    assert set(USECOLS_RATINGS) <= set(schema.names)